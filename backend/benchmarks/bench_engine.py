@@ -0,0 +1,94 @@
+"""Offline simulation of the scheduling engine, without HTTP.
+
+Replays a seeded random stream of student requests, retries of requests
+that are still queued or allocated, and deallocations against
+engine.ProcessManager, and reports throughput and the latency of each
+operation, plus the final state.
+
+Usage:
+    python bench_engine.py [--operations 20000] [--seed 1]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from engine import ProcessManager
+
+RESOURCE_TYPES = ['pc', 'book', 'seat']
+
+
+def simulate(operations, seed):
+    rng = random.Random(seed)
+    manager = ProcessManager(verbose=False)
+    timings = {'add': [], 'duplicate': [], 'deallocate': [], 'snapshot': []}
+    statuses = {}
+    next_id = 0
+
+    for _ in range(operations):
+        roll = rng.random()
+        start = time.perf_counter()
+        if roll < 0.45:
+            next_id += 1
+            resource_type = rng.choice(RESOURCE_TYPES)
+            result = manager.add_student_request(
+                f"Student {next_id}", str(next_id), resource_type,
+                rng.randint(1, 5), rng.randint(10, 120)
+            )
+            kind = 'add'
+        elif roll < 0.55 and manager.registry:
+            # A retry of a request that is still queued or allocated, for the same resource type
+            student_id, resource_type = rng.choice(list(manager.registry))
+            start = time.perf_counter()
+            result = manager.add_student_request(
+                f"Student {student_id}", student_id, resource_type
+            )
+            kind = 'duplicate'
+        elif roll < 0.95:
+            allocated = manager.get_resource_allocation_data()
+            start = time.perf_counter()
+            if allocated:
+                manager.deallocate_resource(rng.choice(allocated)['resource_id'])
+            result = None
+            kind = 'deallocate'
+        else:
+            manager.get_snapshot()
+            result = None
+            kind = 'snapshot'
+        timings[kind].append((time.perf_counter() - start) * 1e6)
+        if result:
+            statuses[result['status']] = statuses.get(result['status'], 0) + 1
+
+    return manager, timings, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--operations', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manager, timings, statuses = simulate(args.operations, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.operations} operations in {elapsed:.2f}s")
+    print(f"{'operation':<12}{'count':>8}{'p50 us':>10}{'p99 us':>10}")
+    for kind, samples in timings.items():
+        if not samples:
+            continue
+        samples.sort()
+        p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+        print(f"{kind:<12}{len(samples):>8}{statistics.median(samples):>10.1f}{p99:>10.1f}")
+    print("request outcomes:", json.dumps(statuses, sort_keys=True))
+    print("final dashboard:", json.dumps(manager.get_dashboard_data()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""Compare the Flask and asyncio (ASGI) API servers under idle-connection load.
+
+For each server this script starts it on a local port, opens a number of
+idle connections, then measures GET /api/dashboard latency while those
+connections stay open, and the server's resident memory. The idle
+connections differ: Flask has no event stream, so for Flask they are bare
+sockets that never send a request, each holding a server thread; for the
+ASGI server they are live /api/events streams that have received their
+first snapshot. Both servers run the engine with verbose=False and the
+same sample data, so neither pays for console logging.
+
+Usage:
+    python bench_servers.py [--idle 1000] [--requests 200] [--concurrency 10]
+
+Requires Flask, Flask-CORS and uvicorn (see backend/requirements.txt).
+Memory is read from /proc and is only reported on Linux.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROUTES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'routes')
+
+SERVERS = {
+    'flask': lambda port: [
+        sys.executable, '-c',
+        "import app as flask_app; from engine import ProcessManager; "
+        "flask_app.process_manager = ProcessManager(verbose=False); "
+        "flask_app.initialize_sample_data(); "
+        f"flask_app.app.run(port={port}, threaded=True)",
+    ],
+    'asgi': lambda port: [
+        sys.executable, '-m', 'uvicorn', 'asgi_app:app',
+        '--port', str(port), '--log-level', 'warning',
+    ],
+}
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+async def wait_for_port(port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+async def open_idle(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    if path:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        await reader.readuntil(b"\r\n\r\n")
+        # Wait for the initial snapshot frame so we know the stream is live
+        await reader.readuntil(b"data: ")
+        await reader.readuntil(b"\n\n")
+    return reader, writer
+
+
+async def still_open(reader):
+    try:
+        data = await asyncio.wait_for(reader.read(65536), 0.05)
+    except asyncio.TimeoutError:
+        return True  # nothing pending and no EOF: the server is still holding it
+    except OSError:
+        return False
+    return bool(data) and not reader.at_eof()
+
+
+async def count_held(idle):
+    results = await asyncio.gather(*(still_open(reader) for reader, _ in idle))
+    return sum(results)
+
+
+async def timed_get(port, path):
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    await reader.read()
+    writer.close()
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_load(port, total, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            latencies.append(await timed_get(port, '/api/dashboard'))
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+async def bench(name, port, args):
+    proc = subprocess.Popen(
+        SERVERS[name](port), cwd=ROUTES_DIR,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    idle = []
+    try:
+        await wait_for_port(port)
+        baseline = rss_mb(proc.pid)
+
+        stream_path = '/api/events' if name == 'asgi' else None
+        for _ in range(args.idle):
+            try:
+                idle.append(await open_idle(port, stream_path))
+            except (OSError, asyncio.IncompleteReadError):
+                break
+        await asyncio.sleep(1)
+        # Only count connections the server is actually holding, not ones it has closed
+        held = await count_held(idle)
+        loaded = rss_mb(proc.pid)
+
+        latencies = await run_load(port, args.requests, args.concurrency)
+        held_after = await count_held(idle)
+        latencies.sort()
+        return {
+            'server': name,
+            'idle_held': held,
+            'idle_held_after': held_after,
+            'p50_ms': statistics.median(latencies),
+            'p99_ms': latencies[int(len(latencies) * 0.99) - 1],
+            'rss_base_mb': baseline,
+            'rss_loaded_mb': loaded,
+        }
+    finally:
+        # Close the idle sockets before stopping the server: uvicorn waits for open connections
+        for _, writer in idle:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for _, writer in idle), return_exceptions=True)
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def fmt(value):
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--idle', type=int, default=1000, help='idle connections to hold open')
+    parser.add_argument('--requests', type=int, default=200, help='timed dashboard requests')
+    parser.add_argument('--concurrency', type=int, default=10, help='concurrent timed requests')
+    parser.add_argument('--port', type=int, default=5055, help='first port to use')
+    parser.add_argument('--servers', nargs='+', default=list(SERVERS), choices=list(SERVERS))
+    args = parser.parse_args()
+
+    print(f"{'server':<8}{'held':>7}{'after':>7}{'p50 ms':>9}{'p99 ms':>9}{'RSS base':>10}{'RSS idle':>10}")
+    for offset, name in enumerate(args.servers):
+        r = await bench(name, args.port + offset, args)
+        print(f"{r['server']:<8}{r['idle_held']:>7}{r['idle_held_after']:>7}{fmt(r['p50_ms']):>9}{fmt(r['p99_ms']):>9}"
+              f"{fmt(r['rss_base_mb']):>10}{fmt(r['rss_loaded_mb']):>10}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
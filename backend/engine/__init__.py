@@ -0,0 +1,4 @@
+from .process_manager import ProcessManager, serialize_request_result, QUEUE_CAPACITY
+from .sample_data import SAMPLE_STUDENTS, load_sample_data
+
+__all__ = ['ProcessManager', 'serialize_request_result', 'QUEUE_CAPACITY', 'SAMPLE_STUDENTS', 'load_sample_data']
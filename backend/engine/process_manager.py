@@ -0,0 +1,302 @@
+"""Scheduling engine: preemptive priority scheduling with FCFS tie-breaking.
+
+Higher priority numbers win (1 = low ... 5 = emergency). A new request may
+preempt the lowest-priority holder of its resource type only when its own
+priority is strictly higher; the preempted student goes back to the queue.
+Queues are served highest priority first, then by arrival time.
+"""
+import copy
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from models.student import Student
+from models.resource import Resource
+from models.queue import Queue
+from models.allocations import Allocation
+
+# Maximum number of students waiting per resource type
+QUEUE_CAPACITY = {'pc': 50, 'book': 100, 'seat': 100}
+
+# How many idempotency keys to remember
+IDEMPOTENCY_CACHE_SIZE = 1024
+
+class ProcessManager:
+    def __init__(self, queue_capacity=None, verbose=True):
+        if queue_capacity is None:
+            queue_capacity = QUEUE_CAPACITY
+        self.queues = {
+            'pc': Queue('pc', queue_capacity.get('pc')),
+            'book': Queue('book', queue_capacity.get('book')),
+            'seat': Queue('seat', queue_capacity.get('seat'))
+        }
+        self.resources = self.initialize_resources()
+        self.allocations = Allocation()
+        self.preemption_count = 0
+        # Active (queued or allocated) requests keyed by (student_id, resource_type)
+        self.registry = {}
+        # Results of recent requests keyed by (student_id, client-supplied idempotency key)
+        self.idempotency_results = OrderedDict()
+        # Bumped on every state change; the cached snapshot is rebuilt when it moves
+        self.version = 0
+        self.snapshot = None
+        self.snapshot_version = None
+        self.verbose = verbose
+        
+    def initialize_resources(self):
+        resources = []
+        # Initialize PC resources - ONLY 10 PCs total
+        for i in range(1, 11):
+            resources.append(Resource(f"PC-{i:02d}", "pc", f"PC-{i:02d}"))
+        
+        # Initialize Book resources - ONLY 50 Books total
+        for i in range(1, 51):
+            resources.append(Resource(f"Book-{i:03d}", "book", f"Book-{i:03d}"))
+            
+        # Initialize Seat resources - ONLY 30 Seats total
+        for i in range(1, 31):
+            resources.append(Resource(f"Seat-{i:03d}", "seat", f"Seat-{i:03d}"))
+            
+        return resources
+        
+    def add_student_request(self, name, student_id, resource_type, priority=2, required_time=30, idempotency_key=None):
+        # Keys are scoped to the student, and a replay must carry the same request
+        cache_key = (student_id, idempotency_key)
+        fingerprint = (name, resource_type, priority, required_time)
+        
+        # Replay the original response for a retried request, as it was when first admitted
+        if idempotency_key is not None and cache_key in self.idempotency_results:
+            original_fingerprint, serialized = self.idempotency_results[cache_key]
+            if original_fingerprint != fingerprint:
+                return {"status": "idempotency_conflict"}
+            return {"status": serialized["status"], "serialized": copy.deepcopy(serialized)}
+            
+        result = self.admit_student_request(name, student_id, resource_type, priority, required_time)
+        
+        if idempotency_key is not None and result["status"] != "rejected":
+            # Students and resources keep changing, so cache a serialized copy, not the live objects
+            self.idempotency_results[cache_key] = (fingerprint, serialize_request_result(result))
+            if len(self.idempotency_results) > IDEMPOTENCY_CACHE_SIZE:
+                self.idempotency_results.popitem(last=False)
+        return result
+        
+    def admit_student_request(self, name, student_id, resource_type, priority, required_time):
+        # A student already waiting for or holding this resource type is not queued twice
+        existing = self.registry.get((student_id, resource_type))
+        if existing:
+            if existing.status == "allocated":
+                return {"status": "already_allocated", "student": existing}
+            return {"status": "already_queued", "queue_type": resource_type, "student": existing}
+            
+        student = Student(name, student_id, priority, required_time)
+        
+        # Check if resource is available
+        available_resource = self.find_available_resource(resource_type)
+        
+        if available_resource:
+            # Allocate directly if resource available
+            available_resource.allocate(student, required_time)
+            self.allocations.add_allocation(student, available_resource)
+            self.registry[(student_id, resource_type)] = student
+            self.version += 1
+            return {"status": "allocated", "resource": available_resource, "student": student}
+        else:
+            # No resources available - check for preemption
+            preempted = self.check_and_preempt(student, resource_type)
+            if preempted:
+                # Preemption happened, now allocate to the freed resource
+                available_resource = self.find_available_resource(resource_type)
+                if available_resource:
+                    available_resource.allocate(student, required_time)
+                    self.allocations.add_allocation(student, available_resource)
+                    self.registry[(student_id, resource_type)] = student
+                    self.version += 1
+                    return {"status": "allocated", "resource": available_resource, "student": student}
+            
+            # Shed load instead of letting the queue grow without limit
+            if self.queues[resource_type].is_full():
+                return {"status": "rejected", "queue_type": resource_type, "student": student}
+            
+            # If no preemption or still no resources, add to queue
+            self.queues[resource_type].add_student(student)
+            self.registry[(student_id, resource_type)] = student
+            self.version += 1
+            return {"status": "queued", "queue_type": resource_type, "student": student}
+            
+    def check_and_preempt(self, new_student, resource_type):
+        # Find the lowest priority allocated resource that can be preempted
+        lowest_priority_resource = None
+        
+        for resource in self.resources:
+            if (resource.resource_type == resource_type and 
+                resource.status == "allocated" and 
+                resource.allocated_to and 
+                resource.allocated_to.priority < new_student.priority and  # Only preempt if new student has higher priority
+                (lowest_priority_resource is None or
+                 resource.allocated_to.priority < lowest_priority_resource.allocated_to.priority)):
+                
+                lowest_priority_resource = resource
+        
+        # Preempt the lowest priority resource
+        if lowest_priority_resource:
+            preempted_student = lowest_priority_resource.allocated_to
+            lowest_priority_resource.deallocate()
+            self.allocations.remove_allocation(preempted_student, lowest_priority_resource)
+            # Preempted students always go back to the queue, even when it is full
+            preempted_student.status = "waiting"
+            self.queues[resource_type].add_student(preempted_student)
+            self.preemption_count += 1
+            self.version += 1
+            if self.verbose:
+                print(f"🚨 PREEMPTION: {new_student.name} (P{new_student.priority}) preempted {preempted_student.name} (P{preempted_student.priority})")
+            return True
+        return False
+                
+    def find_available_resource(self, resource_type):
+        for resource in self.resources:
+            if resource.resource_type == resource_type and resource.status == "available":
+                return resource
+        return None
+        
+    def deallocate_resource(self, resource_id):
+        for resource in self.resources:
+            if resource.resource_id == resource_id and resource.status == "allocated":
+                student = resource.allocated_to
+                resource.deallocate()
+                self.allocations.remove_allocation(student, resource)
+                self.registry.pop((student.student_id, resource.resource_type), None)
+                self.version += 1
+                self.allocate_from_queue(resource.resource_type)
+                return True
+        return False
+        
+    def allocate_from_queue(self, resource_type):
+        queue = self.queues[resource_type]
+        available_resource = self.find_available_resource(resource_type)
+        
+        # Allocate to next student in queue if resource available
+        if available_resource and queue.get_queue_length() > 0:
+            next_student = queue.get_next_student()
+            if next_student:
+                queue.remove_student(next_student)
+                available_resource.allocate(next_student, next_student.required_time)
+                self.allocations.add_allocation(next_student, available_resource)
+                self.version += 1
+                if self.verbose:
+                    print(f"✅ AUTO-ALLOCATED from queue: {next_student.name} to {available_resource.name}")
+                
+    def get_dashboard_data(self):
+        # Count allocated resources by type
+        allocated_pc = len([r for r in self.resources if r.resource_type == 'pc' and r.status == 'allocated'])
+        allocated_book = len([r for r in self.resources if r.resource_type == 'book' and r.status == 'allocated'])
+        allocated_seat = len([r for r in self.resources if r.resource_type == 'seat' and r.status == 'allocated'])
+        
+        # Count available resources by type
+        available_pc = len([r for r in self.resources if r.resource_type == 'pc' and r.status == 'available'])
+        available_book = len([r for r in self.resources if r.resource_type == 'book' and r.status == 'available'])
+        available_seat = len([r for r in self.resources if r.resource_type == 'seat' and r.status == 'available'])
+        
+        # Verify totals (should match our initialization)
+        total_pc = allocated_pc + available_pc  # Should be 10
+        total_book = allocated_book + available_book  # Should be 50  
+        total_seat = allocated_seat + available_seat  # Should be 30
+        
+        if self.verbose:
+            print(f"🔍 RESOURCE CHECK: PC={allocated_pc} allocated + {available_pc} available = {total_pc} total")
+            print(f"🔍 RESOURCE CHECK: Book={allocated_book} allocated + {available_book} available = {total_book} total")
+            print(f"🔍 RESOURCE CHECK: Seat={allocated_seat} allocated + {available_seat} available = {total_seat} total")
+        
+        queue_counts = {q_type: queue.get_queue_length() for q_type, queue in self.queues.items()}
+        total_allocated = allocated_pc + allocated_book + allocated_seat
+        
+        return {
+            'total_allocated': total_allocated,
+            'available_resources': {
+                'pc': available_pc,
+                'book': available_book,
+                'seat': available_seat
+            },
+            'allocated_resources': {
+                'pc': allocated_pc,
+                'book': allocated_book,
+                'seat': allocated_seat
+            },
+            'queue_counts': queue_counts,
+            'preemption_count': self.preemption_count,
+            'total_students': total_allocated + sum(queue_counts.values())
+        }
+        
+    def get_resource_allocation_data(self):
+        allocated_resources = []
+        for resource in self.resources:
+            if resource.status == "allocated" and resource.allocated_to:
+                allocated_resources.append({
+                    'resource_id': resource.resource_id,
+                    'resource_type': resource.resource_type,
+                    'resource_name': resource.name,
+                    'student_name': resource.allocated_to.name,
+                    'student_id': resource.allocated_to.student_id,
+                    'priority': resource.allocated_to.priority,
+                    'time_required': resource.allocated_to.required_time,
+                    'remaining_time': resource.remaining_time,
+                    'status': 'ALLOCATED'
+                })
+        return allocated_resources
+        
+    def get_queue_data(self):
+        queue_data = {}
+        for q_type, queue in self.queues.items():
+            queue_data[q_type] = {
+                'queue_type': q_type,
+                'students': [],
+                'length': queue.get_queue_length()
+            }
+            for i, student in enumerate(queue.students):
+                wait_time = (datetime.now() - student.arrival_time).seconds // 60
+                queue_data[q_type]['students'].append({
+                    'position': i + 1,
+                    'student_name': student.name,
+                    'student_id': student.student_id,
+                    'resource_type': q_type,
+                    'priority': student.priority,
+                    'arrival_time': student.arrival_time.strftime("%H:%M:%S"),
+                    'wait_time': f"{wait_time}m"
+                })
+        return queue_data
+        
+    def get_snapshot(self):
+        """Dashboard, allocation and queue data as JSON-encoded bytes.
+        
+        Encoded once per state change and reused until the next one, so it can
+        be written to any number of clients as-is. Queue wait times are as of
+        the last change.
+        """
+        if self.snapshot_version != self.version:
+            self.snapshot = json.dumps({
+                'dashboard': self.get_dashboard_data(),
+                'allocations': self.get_resource_allocation_data(),
+                'queues': self.get_queue_data()
+            }).encode()
+            self.snapshot_version = self.version
+        return self.snapshot
+
+def serialize_request_result(result):
+    """Convert Student and Resource objects in a request result to dictionaries for JSON serialization"""
+    # Idempotent replays already carry the original serialized response
+    if "serialized" in result:
+        return result["serialized"]
+    
+    serialized_result = {
+        "status": result["status"],
+        "queue_type": result.get("queue_type")
+    }
+    
+    # Convert Student object to dict if present
+    if "student" in result:
+        serialized_result["student"] = result["student"].to_dict()
+        
+    # Convert Resource object to dict if present  
+    if "resource" in result:
+        serialized_result["resource"] = result["resource"].to_dict()
+        
+    return serialized_result
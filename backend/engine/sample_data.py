@@ -0,0 +1,53 @@
+# Sample students to demonstrate the queue system
+SAMPLE_STUDENTS = [
+    # First batch - should get allocated immediately to PCs
+    {"name": "Alice Sharma", "student_id": "1001", "resource_type": "pc", "priority": 2, "required_time": 45},
+    {"name": "Bob Singh", "student_id": "1002", "resource_type": "pc", "priority": 2, "required_time": 30},
+    {"name": "Charlie Kumar", "student_id": "1003", "resource_type": "pc", "priority": 2, "required_time": 60},
+    {"name": "Diana Patel", "student_id": "1004", "resource_type": "pc", "priority": 2, "required_time": 30},
+    {"name": "Eva Verma", "student_id": "1005", "resource_type": "pc", "priority": 2, "required_time": 25},
+    {"name": "Frank Joshi", "student_id": "1006", "resource_type": "pc", "priority": 2, "required_time": 90},
+    {"name": "Grace Reddy", "student_id": "1007", "resource_type": "pc", "priority": 2, "required_time": 50},
+    {"name": "Henry Malhotra", "student_id": "1008", "resource_type": "pc", "priority": 2, "required_time": 40},
+    {"name": "Isha Gupta", "student_id": "1009", "resource_type": "pc", "priority": 2, "required_time": 35},
+    
+    # These should go to PC queue (only 10 PCs total, first 9 got allocated)
+    {"name": "Jack Choudhary", "student_id": "1010", "resource_type": "pc", "priority": 2, "required_time": 20},
+    {"name": "Kiran Mehta", "student_id": "1011", "resource_type": "pc", "priority": 2, "required_time": 75},
+    
+    # Book requests - should get allocated (50 books available)
+    {"name": "Lina Nair", "student_id": "1012", "resource_type": "book", "priority": 2, "required_time": 55},
+    {"name": "Mohan Das", "student_id": "1013", "resource_type": "book", "priority": 2, "required_time": 30},
+    {"name": "Neha Kapoor", "student_id": "1014", "resource_type": "book", "priority": 3, "required_time": 25},
+    
+    # Seat requests - should get allocated (30 seats available)  
+    {"name": "Om Prakash", "student_id": "1015", "resource_type": "seat", "priority": 2, "required_time": 60},
+    {"name": "Priya Singh", "student_id": "1016", "resource_type": "seat", "priority": 1, "required_time": 90},
+]
+
+def load_sample_data(manager):
+    """Add the sample students to a ProcessManager"""
+    print("🚀 Initializing sample data...")
+    for student_data in SAMPLE_STUDENTS:
+        try:
+            result = manager.add_student_request(
+                student_data["name"],
+                student_data["student_id"],
+                student_data["resource_type"],
+                student_data["priority"],
+                student_data["required_time"]
+            )
+            status = result["status"]
+            if status == "allocated":
+                resource_info = f" to {result['resource'].name}"
+            elif status == "already_allocated":
+                resource_info = f" (already holds a {student_data['resource_type']})"
+            elif status == "already_queued":
+                resource_info = f" (already waiting for {student_data['resource_type']})"
+            elif status == "rejected":
+                resource_info = f" ({student_data['resource_type']} queue is full)"
+            else:
+                resource_info = f" (waiting for {student_data['resource_type']})"
+            print(f"✅ Added {student_data['name']} - {status}{resource_info}")
+        except Exception as e:
+            print(f"❌ Error adding {student_data['name']}: {e}")
@@ -0,0 +1,139 @@
+import json
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from engine import ProcessManager, serialize_request_result
+
+
+def fill_pcs(manager, priority=2):
+    for i in range(10):
+        manager.add_student_request(f"Student {i}", str(i), "pc", priority)
+
+
+def test_allocates_until_resources_run_out_then_queues():
+    manager = ProcessManager(verbose=False)
+    fill_pcs(manager)
+
+    result = manager.add_student_request("Late Student", "100", "pc")
+
+    assert result["status"] == "queued"
+    assert manager.queues["pc"].get_queue_length() == 1
+
+
+def test_higher_priority_preempts_lowest_priority_holder():
+    manager = ProcessManager(verbose=False)
+    fill_pcs(manager, priority=3)
+    manager.deallocate_resource("PC-05")
+    manager.add_student_request("Low Student", "50", "pc", priority=1)
+
+    result = manager.add_student_request("Emergency Student", "99", "pc", priority=5)
+
+    assert result["status"] == "allocated"
+    assert result["resource"].resource_id == "PC-05"
+    assert manager.preemption_count == 1
+    preempted = manager.queues["pc"].get_next_student()
+    assert preempted.student_id == "50"
+    assert preempted.status == "waiting"
+
+
+def test_equal_or_lower_priority_does_not_preempt():
+    manager = ProcessManager(verbose=False)
+    fill_pcs(manager, priority=3)
+
+    equal = manager.add_student_request("Equal Student", "100", "pc", priority=3)
+    lower = manager.add_student_request("Lower Student", "101", "pc", priority=1)
+
+    assert equal["status"] == "queued"
+    assert lower["status"] == "queued"
+    assert manager.preemption_count == 0
+
+
+def test_queue_serves_highest_priority_first_then_fcfs():
+    manager = ProcessManager(verbose=False)
+    fill_pcs(manager, priority=5)
+    manager.add_student_request("First Medium", "100", "pc", priority=2)
+    manager.add_student_request("High", "101", "pc", priority=4)
+    manager.add_student_request("Second Medium", "102", "pc", priority=2)
+
+    manager.deallocate_resource("PC-01")
+
+    assert manager.registry[("101", "pc")].status == "allocated"
+    assert [s.student_id for s in manager.queues["pc"].students] == ["100", "102"]
+
+
+def test_duplicate_and_idempotent_requests():
+    manager = ProcessManager(verbose=False)
+    first = manager.add_student_request("Alice", "1", "pc", idempotency_key="retry-1")
+
+    replay = manager.add_student_request("Alice", "1", "pc", idempotency_key="retry-1")
+    assert serialize_request_result(replay) == serialize_request_result(first)
+    assert manager.add_student_request("Alice", "1", "pc")["status"] == "already_allocated"
+    assert manager.get_dashboard_data()["total_allocated"] == 1
+
+
+def test_idempotent_replay_returns_the_original_response():
+    manager = ProcessManager(verbose=False)
+    fill_pcs(manager)
+    manager.deallocate_resource("PC-01")
+    allocated = manager.add_student_request("Alice", "100", "pc", idempotency_key="k")
+    queued = manager.add_student_request("Bob", "101", "pc", idempotency_key="k")
+    original_allocated = serialize_request_result(allocated)
+    original_queued = serialize_request_result(queued)
+
+    # Alice finishes and PC-01 passes to Bob, who was queued
+    manager.deallocate_resource("PC-01")
+
+    replay_allocated = serialize_request_result(
+        manager.add_student_request("Alice", "100", "pc", idempotency_key="k"))
+    replay_queued = serialize_request_result(
+        manager.add_student_request("Bob", "101", "pc", idempotency_key="k"))
+    assert replay_allocated == original_allocated
+    assert replay_allocated["student"]["status"] == "allocated"
+    assert replay_allocated["resource"]["allocated_to"]["student_id"] == "100"
+    assert replay_queued == original_queued
+    assert replay_queued["student"]["status"] == "waiting"
+
+    # Callers cannot alter the cached response
+    replay_allocated["status"] = "tampered"
+    replay = manager.add_student_request("Alice", "100", "pc", idempotency_key="k")
+    assert serialize_request_result(replay)["status"] == "allocated"
+
+
+def test_idempotency_key_is_scoped_to_student_and_request():
+    manager = ProcessManager(verbose=False)
+    first = manager.add_student_request("Alice", "1", "pc", idempotency_key="retry-1")
+
+    # Another student reusing the key gets their own request processed
+    other = manager.add_student_request("Bob", "2", "pc", idempotency_key="retry-1")
+    assert other["student"].student_id == "2"
+
+    # The same student reusing the key for a different request is refused
+    conflict = manager.add_student_request("Alice", "1", "book", idempotency_key="retry-1")
+    assert conflict["status"] == "idempotency_conflict"
+    assert ("1", "book") not in manager.registry
+
+
+def test_full_queue_rejects_new_requests():
+    manager = ProcessManager(queue_capacity={"pc": 1}, verbose=False)
+    fill_pcs(manager)
+    manager.add_student_request("Queued", "100", "pc")
+
+    result = manager.add_student_request("Rejected", "101", "pc")
+
+    assert result["status"] == "rejected"
+    assert ("101", "pc") not in manager.registry
+
+
+def test_snapshot_is_cached_until_state_changes():
+    manager = ProcessManager(verbose=False)
+    manager.add_student_request("Alice", "1", "pc")
+
+    snapshot = manager.get_snapshot()
+    assert manager.get_snapshot() is snapshot
+    assert json.loads(snapshot)["dashboard"]["total_allocated"] == 1
+
+    manager.deallocate_resource("PC-01")
+    assert json.loads(manager.get_snapshot())["dashboard"]["total_allocated"] == 0
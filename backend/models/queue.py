@@ -1,12 +1,13 @@
 class Queue:
-    def __init__(self, queue_type):
+    def __init__(self, queue_type, capacity=None):
         self.queue_type = queue_type
+        self.capacity = capacity  # None means unbounded
         self.students = []
         
     def add_student(self, student):
         self.students.append(student)
         # Sorting by priority (highest first), then by arrival time (FCFS)
-        self.students.sort(key=lambda x: (x.priority, x.arrival_time))
+        self.students.sort(key=lambda x: (-x.priority, x.arrival_time))
         
     def remove_student(self, student):
         if student in self.students:
@@ -19,4 +20,7 @@ class Queue:
         return None
         
     def get_queue_length(self):
-        return len(self.students)
\ No newline at end of file
+        return len(self.students)
+        
+    def is_full(self):
+        return self.capacity is not None and len(self.students) >= self.capacity
\ No newline at end of file
@@ -0,0 +1,334 @@
+"""ASGI entry point for the Library Management System API.
+
+Serves the same /api/* routes as the Flask app from a single asyncio event
+loop, so long-lived event-stream connections cost a coroutine instead of a
+thread. All scheduler access goes through one asyncio lock, and every
+subscriber to /api/events shares one pre-encoded snapshot per state change.
+
+Run with:  python asgi_app.py   (or: uvicorn asgi_app:app --port 5000)
+"""
+import asyncio
+import json
+import re
+import sys
+import os
+
+# Add the parent directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from engine import ProcessManager, serialize_request_result, load_sample_data
+from rate_limit import TokenBucket, MUTATION_RATE, MUTATION_BURST, QUEUE_FULL_RETRY_AFTER
+
+# Seconds between keep-alive comments on idle event streams
+HEARTBEAT_INTERVAL = 15
+
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+    (b"access-control-allow-headers", b"Content-Type, Idempotency-Key"),
+]
+
+
+class SchedulerService:
+    """Owns the ProcessManager and serializes every call into it"""
+
+    def __init__(self):
+        self.process_manager = ProcessManager(verbose=False)
+        self.lock = asyncio.Lock()
+        self.version = 0
+        self.changed = asyncio.Event()
+        self.snapshot = b""
+        # Which manager/version the current frame was built from
+        self.published_manager = None
+        self.published_version = None
+
+    async def read(self, method, *args):
+        async with self.lock:
+            return getattr(self.process_manager, method)(*args)
+
+    async def write(self, method, *args):
+        async with self.lock:
+            result = getattr(self.process_manager, method)(*args)
+            self._publish()
+            return result
+
+    async def reset(self):
+        async with self.lock:
+            self.process_manager = ProcessManager(verbose=False)
+            load_sample_data(self.process_manager)
+            self._publish()
+
+    async def seed(self):
+        async with self.lock:
+            load_sample_data(self.process_manager)
+            self._publish()
+
+    def _publish(self):
+        manager = self.process_manager
+        # No-op writes (duplicates, empty queues) leave the current frame in place
+        if manager is self.published_manager and manager.version == self.published_version:
+            return
+        self.published_manager = manager
+        self.published_version = manager.version
+        self.version += 1
+        # The engine encodes the snapshot once; every open stream writes the same bytes
+        self.snapshot = (
+            b"id: %d\nevent: snapshot\ndata: " % self.version + manager.get_snapshot() + b"\n\n"
+        )
+        waiting, self.changed = self.changed, asyncio.Event()
+        waiting.set()
+
+
+class TooManyRequests(Exception):
+    def __init__(self, error, retry_after):
+        super().__init__(error)
+        self.retry_after = retry_after
+
+
+class Conflict(Exception):
+    pass
+
+
+service = None
+mutation_limiter = TokenBucket(MUTATION_RATE, MUTATION_BURST)
+
+
+async def send_json(send, payload, status=200, headers=()):
+    # Pre-encoded payloads (bytes) are sent as-is
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ] + CORS_HEADERS + list(headers),
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def read_json(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    return json.loads(body) if body else {}
+
+
+async def home(scope, receive, send):
+    return {"message": "Library Management System API", "status": "running"}
+
+
+async def get_dashboard(scope, receive, send):
+    data = await service.read("get_dashboard_data")
+    return {"success": True, "data": data}
+
+
+async def add_student(scope, receive, send):
+    data = await read_json(receive)
+    name = data.get('name')
+    student_id = data.get('student_id')
+    resource_type = data.get('resource_type')
+    priority = data.get('priority', 2)
+    required_time = data.get('required_time', 30)
+    idempotency_key = dict(scope.get("headers", [])).get(b"idempotency-key")
+    idempotency_key = idempotency_key.decode() if idempotency_key else data.get('idempotency_key')
+
+    if not all([name, student_id, resource_type]):
+        return {"success": False, "error": "Missing required fields"}
+
+    if idempotency_key is not None and not isinstance(idempotency_key, str):
+        return {"success": False, "error": "idempotency_key must be a string"}
+
+    result = await service.write(
+        "add_student_request", name, student_id, resource_type, priority, required_time, idempotency_key
+    )
+    if result["status"] == "rejected":
+        raise TooManyRequests(f"{resource_type} queue is full", QUEUE_FULL_RETRY_AFTER)
+    if result["status"] == "idempotency_conflict":
+        raise Conflict("Idempotency key was already used for a different request")
+    return {
+        "success": True,
+        "message": f"Student {result['status'].replace('_', ' ')}",
+        "data": serialize_request_result(result)
+    }
+
+
+async def get_snapshot(scope, receive, send):
+    data = await service.read("get_snapshot")
+    return b'{"success": true, "data": ' + data + b'}'
+
+
+async def get_allocations(scope, receive, send):
+    data = await service.read("get_resource_allocation_data")
+    return {"success": True, "data": data}
+
+
+async def get_queues(scope, receive, send):
+    data = await service.read("get_queue_data")
+    return {"success": True, "data": data}
+
+
+async def deallocate_resource(scope, receive, send, resource_id):
+    success = await service.write("deallocate_resource", resource_id)
+    if success:
+        return {"success": True, "message": "Resource deallocated successfully"}
+    return {"success": False, "error": "Resource not found or not allocated"}
+
+
+async def allocate_next(scope, receive, send):
+    data = await read_json(receive)
+    resource_type = data.get('resource_type')
+
+    if not resource_type:
+        return {"success": False, "error": "Resource type required"}
+
+    await service.write("allocate_from_queue", resource_type)
+    return {"success": True, "message": "Allocation process triggered"}
+
+
+async def initialize_data(scope, receive, send):
+    await service.seed()
+    return {"success": True, "message": "Sample data initialized successfully"}
+
+
+async def reset_data(scope, receive, send):
+    await service.reset()
+    return {"success": True, "message": "Data reset successfully"}
+
+
+async def wait_for_disconnect(receive):
+    # The first message carries the (empty) request body; keep reading until the client goes away
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def event_stream(scope, receive, send):
+    """Server-sent events: the engine snapshot on connect and after every change"""
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+        ] + CORS_HEADERS,
+    })
+    sent_version = service.version
+    await send({"type": "http.response.body", "body": service.snapshot, "more_body": True})
+
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        while True:
+            # Compare versions first so a change published while we were sending is not missed
+            if service.version != sent_version:
+                sent_version = service.version
+                chunk = service.snapshot
+            else:
+                changed = asyncio.ensure_future(service.changed.wait())
+                done, _ = await asyncio.wait(
+                    {changed, disconnected},
+                    timeout=HEARTBEAT_INTERVAL,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnected in done:
+                    changed.cancel()
+                    return
+                if changed in done:
+                    continue
+                changed.cancel()
+                chunk = b": keep-alive\n\n"
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    finally:
+        client_gone = disconnected.done() and not disconnected.cancelled()
+        disconnected.cancel()
+        if not client_gone:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+ROUTES = [
+    ('GET', re.compile(r'^/$'), home),
+    ('GET', re.compile(r'^/api/dashboard$'), get_dashboard),
+    ('POST', re.compile(r'^/api/add-student$'), add_student),
+    ('GET', re.compile(r'^/api/snapshot$'), get_snapshot),
+    ('GET', re.compile(r'^/api/allocations$'), get_allocations),
+    ('GET', re.compile(r'^/api/queues$'), get_queues),
+    ('POST', re.compile(r'^/api/deallocate/(?P<resource_id>[^/]+)$'), deallocate_resource),
+    ('POST', re.compile(r'^/api/allocate-next$'), allocate_next),
+    ('POST', re.compile(r'^/api/initialize-data$'), initialize_data),
+    ('POST', re.compile(r'^/api/reset-data$'), reset_data),
+]
+
+STREAM_ROUTES = {
+    '/api/events': event_stream,
+}
+
+
+async def lifespan(receive, send):
+    global service
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            print("🎯 Starting Library Management System (asyncio)...")
+            service = SchedulerService()
+            await service.seed()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    method = scope["method"]
+    path = scope["path"]
+
+    if method == 'OPTIONS':
+        await send({"type": "http.response.start", "status": 204, "headers": CORS_HEADERS})
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    if method == 'GET' and path in STREAM_ROUTES:
+        await STREAM_ROUTES[path](scope, receive, send)
+        return
+
+    for route_method, pattern, handler in ROUTES:
+        match = pattern.match(path)
+        if match and route_method == method:
+            try:
+                if method == 'POST':
+                    allowed, retry_after = mutation_limiter.acquire()
+                    if not allowed:
+                        raise TooManyRequests("Too many requests, please retry later", retry_after)
+                payload = await handler(scope, receive, send, **match.groupdict())
+            except TooManyRequests as e:
+                await send_json(
+                    send, {"success": False, "error": str(e)}, status=429,
+                    headers=[(b"retry-after", str(e.retry_after).encode())],
+                )
+                return
+            except Conflict as e:
+                await send_json(send, {"success": False, "error": str(e)}, status=409)
+                return
+            except Exception as e:
+                payload = {"success": False, "error": str(e)}
+            await send_json(send, payload)
+            return
+        if match:
+            await send_json(send, {"success": False, "error": "Method not allowed"}, status=405)
+            return
+
+    await send_json(send, {"success": False, "error": "Not found"}, status=404)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, port=5000, log_level="warning")
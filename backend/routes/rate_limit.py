@@ -0,0 +1,39 @@
+import math
+import threading
+import time
+
+# Mutation endpoints: sustained requests per second and burst size
+MUTATION_RATE = 20
+MUTATION_BURST = 40
+
+# Seconds a client is asked to wait when a queue is full
+QUEUE_FULL_RETRY_AFTER = 10
+
+
+class TokenBucket:
+    """Token-bucket rate limiter.
+
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    Each request takes one token; when the bucket is empty the request is
+    refused along with the number of seconds until a token is available.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token. Returns (allowed, retry_after_seconds)."""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True, 0
+            return False, math.ceil((1 - self.tokens) / self.rate)
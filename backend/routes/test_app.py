@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+import app as flask_app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(flask_app, "process_manager", flask_app.ProcessManager(verbose=False))
+    monkeypatch.setattr(flask_app, "mutation_limiter", flask_app.TokenBucket(1000, 1000))
+    return flask_app.app.test_client()
+
+
+def test_full_queue_returns_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(flask_app, "process_manager",
+                        flask_app.ProcessManager(queue_capacity={"pc": 1}, verbose=False))
+    for i in range(11):
+        client.post("/api/add-student", json={"name": f"S{i}", "student_id": str(i), "resource_type": "pc"})
+
+    response = client.post("/api/add-student", json={"name": "Late", "student_id": "99", "resource_type": "pc"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(flask_app.QUEUE_FULL_RETRY_AFTER)
+    assert response.get_json()["success"] is False
+
+
+def test_mutation_rate_limit_returns_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(flask_app, "mutation_limiter", flask_app.TokenBucket(0.5, 1, clock=lambda: 0))
+
+    assert client.post("/api/allocate-next", json={"resource_type": "pc"}).status_code == 200
+    response = client.post("/api/allocate-next", json={"resource_type": "pc"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert client.get("/api/dashboard").status_code == 200
+
+
+def test_idempotency_key_must_be_a_string_and_match_the_request(client):
+    student = {"name": "Alice", "student_id": "500", "resource_type": "book"}
+
+    invalid = client.post("/api/add-student", json=dict(student, idempotency_key=["a"]))
+    assert invalid.get_json() == {"success": False, "error": "idempotency_key must be a string"}
+
+    assert client.post("/api/add-student", json=dict(student, idempotency_key="k1")).get_json()["success"] is True
+    conflict = client.post("/api/add-student", json=dict(student, resource_type="seat", idempotency_key="k1"))
+    assert conflict.status_code == 409
+
+
+def test_concurrent_duplicate_submissions_queue_the_student_once(client, monkeypatch):
+    manager = flask_app.ProcessManager(verbose=False)
+    for i in range(10):
+        manager.add_student_request(f"S{i}", str(i), "pc")
+    monkeypatch.setattr(flask_app, "process_manager", manager)
+
+    # Widen the window between the duplicate check and the queue insert so overlapping requests race
+    find_available_resource = manager.find_available_resource
+
+    def slow_find_available_resource(resource_type):
+        time.sleep(0.01)
+        return find_available_resource(resource_type)
+
+    monkeypatch.setattr(manager, "find_available_resource", slow_find_available_resource)
+
+    barrier = threading.Barrier(8)
+    responses = []
+
+    def submit():
+        barrier.wait()
+        responses.append(client.post("/api/add-student", json={
+            "name": "Double Click", "student_id": "77", "resource_type": "pc"
+        }))
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    statuses = sorted(r.get_json()["data"]["status"] for r in responses)
+    assert statuses == ["already_queued"] * 7 + ["queued"]
+    assert [s.student_id for s in manager.queues["pc"].students].count("77") == 1
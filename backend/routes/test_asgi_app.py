@@ -0,0 +1,201 @@
+import asyncio
+import json
+
+import asgi_app
+
+
+async def start_service():
+    asgi_app.service = asgi_app.SchedulerService()
+    await asgi_app.service.seed()
+
+
+async def call(method, path, payload=None, headers=()):
+    """Run one request through the ASGI app the way a server would"""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+    await asgi_app.app(scope, receive, send)
+    return sent
+
+
+class StreamClient:
+    """Holds an /api/events request open until disconnect() is called"""
+
+    def __init__(self):
+        self.sent = []
+        self.messages = [{"type": "http.request", "body": b"", "more_body": False}]
+        self.gone = asyncio.Event()
+
+    async def receive(self):
+        if self.messages:
+            return self.messages.pop(0)
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    def start(self):
+        scope = {"type": "http", "method": "GET", "path": "/api/events", "headers": []}
+        return asyncio.ensure_future(asgi_app.app(scope, self.receive, self.send))
+
+    def disconnect(self):
+        self.gone.set()
+
+    def event_ids(self):
+        return [
+            line for message in self.sent
+            for line in message.get("body", b"").split(b"\n")
+            if line.startswith(b"id: ")
+        ]
+
+
+def test_event_stream_stays_open_and_delivers_changes():
+    async def scenario():
+        await start_service()
+        client = StreamClient()
+        task = client.start()
+        await asyncio.sleep(0.2)
+
+        assert not task.done()
+        assert len(client.event_ids()) == 1
+
+        await call("POST", "/api/add-student",
+                   {"name": "Stream Student", "student_id": "9001", "resource_type": "book"})
+        await asyncio.sleep(0.05)
+        assert len(client.event_ids()) == 2
+        assert client.sent[-1]["more_body"] is True
+
+        client.disconnect()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(scenario())
+
+
+def test_event_stream_does_not_miss_change_published_during_send():
+    async def scenario():
+        await start_service()
+        client = StreamClient()
+        original_send = client.send
+        published = []
+
+        async def slow_send(message):
+            await original_send(message)
+            # A write lands while the stream is between send() and its next wait()
+            if message.get("body") and not published:
+                published.append(True)
+                await asgi_app.service.write("deallocate_resource", "PC-01")
+
+        client.send = slow_send
+        task = client.start()
+        await asyncio.sleep(0.05)
+
+        assert len(client.event_ids()) == 2
+
+        client.disconnect()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(scenario())
+
+
+def test_event_stream_completes_response_when_cancelled():
+    async def scenario():
+        await start_service()
+        client = StreamClient()
+        task = client.start()
+        await asyncio.sleep(0.05)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert client.sent[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+    asyncio.run(scenario())
+
+
+def response_of(sent):
+    start, body = sent[0], sent[1]
+    return start["status"], dict(start["headers"]), json.loads(body["body"])
+
+
+def test_full_queue_returns_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(asgi_app, "mutation_limiter", asgi_app.TokenBucket(1000, 1000))
+
+    async def scenario():
+        await start_service()
+        asgi_app.service.process_manager = asgi_app.ProcessManager(queue_capacity={"pc": 1}, verbose=False)
+        for i in range(11):
+            await call("POST", "/api/add-student", {"name": f"S{i}", "student_id": str(i), "resource_type": "pc"})
+        return await call("POST", "/api/add-student", {"name": "Late", "student_id": "99", "resource_type": "pc"})
+
+    status, headers, body = response_of(asyncio.run(scenario()))
+    assert status == 429
+    assert headers[b"retry-after"] == str(asgi_app.QUEUE_FULL_RETRY_AFTER).encode()
+    assert body["success"] is False
+
+
+def test_mutation_rate_limit_returns_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(asgi_app, "mutation_limiter", asgi_app.TokenBucket(0.5, 1, clock=lambda: 0))
+
+    async def scenario():
+        await start_service()
+        first = await call("POST", "/api/allocate-next", {"resource_type": "pc"})
+        second = await call("POST", "/api/allocate-next", {"resource_type": "pc"})
+        reads = await call("GET", "/api/dashboard")
+        return first, second, reads
+
+    first, second, reads = asyncio.run(scenario())
+    assert response_of(first)[0] == 200
+    status, headers, _ = response_of(second)
+    assert status == 429
+    assert headers[b"retry-after"] == b"2"
+    assert response_of(reads)[0] == 200
+
+
+def test_idempotency_key_must_be_a_string_and_match_the_request(monkeypatch):
+    monkeypatch.setattr(asgi_app, "mutation_limiter", asgi_app.TokenBucket(1000, 1000))
+    student = {"name": "Alice", "student_id": "500", "resource_type": "book"}
+
+    async def scenario():
+        await start_service()
+        invalid = await call("POST", "/api/add-student", dict(student, idempotency_key=["a"]))
+        first = await call("POST", "/api/add-student", dict(student, idempotency_key="k1"))
+        conflict = await call("POST", "/api/add-student", dict(student, resource_type="seat", idempotency_key="k1"))
+        return invalid, first, conflict
+
+    invalid, first, conflict = asyncio.run(scenario())
+    assert response_of(invalid)[2] == {"success": False, "error": "idempotency_key must be a string"}
+    assert response_of(first)[2]["success"] is True
+    assert response_of(conflict)[0] == 409
+
+
+def test_event_frames_carry_engine_snapshot_and_skip_no_op_writes(monkeypatch):
+    monkeypatch.setattr(asgi_app, "mutation_limiter", asgi_app.TokenBucket(1000, 1000))
+    student = {"name": "Alice", "student_id": "600", "resource_type": "book"}
+
+    async def scenario():
+        await start_service()
+        service = asgi_app.service
+        await call("POST", "/api/add-student", student)
+        version = service.version
+        frame = service.snapshot
+
+        # A duplicate request and a deallocation of a free resource change nothing
+        await call("POST", "/api/add-student", student)
+        await call("POST", "/api/deallocate/Book-050")
+        return service, version, frame
+
+    service, version, frame = asyncio.run(scenario())
+    assert service.version == version
+    assert service.snapshot is frame
+    data = frame.split(b"data: ", 1)[1].rstrip(b"\n")
+    assert data == service.process_manager.get_snapshot()
@@ -15,6 +15,25 @@ def test_add_student():
     response = requests.post(f"{BASE_URL}/add-student", json=data)
     print("Add Student Response:", response.json())
 
+def test_duplicate_request():
+    data = {
+        "name": "Test Student",
+        "student_id": "12345",
+        "resource_type": "pc",
+        "priority": 2,
+        "required_time": 30
+    }
+    
+    # Retrying with the same idempotency key replays the original result
+    headers = {"Idempotency-Key": "test-duplicate-12345"}
+    first = requests.post(f"{BASE_URL}/add-student", json=data, headers=headers)
+    retry = requests.post(f"{BASE_URL}/add-student", json=data, headers=headers)
+    print("Idempotent Retry Response:", first.json(), retry.json())
+    
+    # A second request without a key is detected as already queued/allocated
+    response = requests.post(f"{BASE_URL}/add-student", json=data)
+    print("Duplicate Request Response:", response.json())
+
 def test_get_dashboard():
     response = requests.get(f"{BASE_URL}/dashboard")
     print("Dashboard Response:", response.json())
@@ -27,10 +46,33 @@ def test_get_queues():
     response = requests.get(f"{BASE_URL}/queues")
     print("Queues Response:", response.json())
 
+def test_event_stream():
+    # Only served by the asyncio server (asgi_app.py)
+    with requests.get(f"{BASE_URL}/events", stream=True, timeout=5) as response:
+        if response.status_code != 200:
+            print(f"Skipping event stream test: /events returned {response.status_code} "
+                  "(run the asyncio server with `python asgi_app.py`)")
+            return
+        lines = response.iter_lines()
+        first_id = next(line for line in lines if line.startswith(b"id: "))
+        print("Event Stream Snapshot:", json.loads(next(line for line in lines if line.startswith(b"data: "))[len(b"data: "):]))
+        
+        # The stream must stay open and push a new snapshot after a change
+        requests.post(f"{BASE_URL}/add-student", json={
+            "name": "Stream Student",
+            "student_id": "54321",
+            "resource_type": "book"
+        })
+        next_id = next(line for line in lines if line.startswith(b"id: "))
+        assert int(next_id[len(b"id: "):]) > int(first_id[len(b"id: "):])
+        print("Event Stream Update:", json.loads(next(line for line in lines if line.startswith(b"data: "))[len(b"data: "):]))
+
 if __name__ == "__main__":
     print("Testing Library Management System API...")
     
     test_add_student()
+    test_duplicate_request()
     test_get_dashboard()
     test_get_allocations()
-    test_get_queues()
\ No newline at end of file
+    test_get_queues()
+    test_event_stream()
\ No newline at end of file
@@ -0,0 +1,41 @@
+from rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_is_allowed_then_exhausted():
+    bucket = TokenBucket(rate=2, capacity=3, clock=FakeClock())
+
+    assert [bucket.acquire()[0] for _ in range(3)] == [True, True, True]
+    assert bucket.acquire()[0] is False
+
+
+def test_tokens_refill_over_time_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    for _ in range(3):
+        bucket.acquire()
+
+    clock.now = 0.5  # one token at 2 per second
+    assert bucket.acquire() == (True, 0)
+    assert bucket.acquire()[0] is False
+
+    clock.now = 100  # refill never exceeds capacity
+    assert [bucket.acquire()[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_retry_after_is_seconds_until_next_token_rounded_up():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.25, capacity=1, clock=clock)
+    bucket.acquire()
+
+    assert bucket.acquire() == (False, 4)
+
+    clock.now = 2.5
+    assert bucket.acquire() == (False, 2)
@@ -24,5 +24,8 @@ class ResourceAllocator:
     def get_queue_data(self):
         return self.process_manager.get_queue_data()
     
+    def get_snapshot(self):
+        return self.process_manager.get_snapshot()
+    
     def get_all_resources(self):
         return [resource.to_dict() for resource in self.process_manager.resources]
\ No newline at end of file